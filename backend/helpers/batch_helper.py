@@ -0,0 +1,70 @@
+# backend/helpers/batch_helper.py
+
+import asyncio
+
+
+class DynBatcher:
+    """
+    Coalesce jobs arriving within a short window and run them as one batch.
+
+    Requests that land within `max_delay` of each other (or fill a batch of
+    `max_batch_size`) are submitted together with asyncio.gather, so
+    concurrent uploads share the client's connection pool instead of each
+    paying its own setup on the hot path. Each caller awaits its own future
+    and gets exactly its own result or exception back.
+    """
+
+    def __init__(self, process_one, max_batch_size=8, max_delay=0.05):
+        self._process_one = process_one
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._pending = []
+        self._lock = asyncio.Lock()
+        self._flush_task = None
+
+    async def process_batched(self, item):
+        future = asyncio.get_running_loop().create_future()
+        async with self._lock:
+            self._pending.append((item, future))
+            if len(self._pending) >= self._max_batch_size:
+                if self._flush_task is not None:
+                    self._flush_task.cancel()
+                    self._flush_task = None
+                self._dispatch_locked()
+            elif self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._delayed_flush())
+        return await future
+
+    async def _delayed_flush(self):
+        try:
+            await asyncio.sleep(self._max_delay)
+        except asyncio.CancelledError:
+            return
+        async with self._lock:
+            self._flush_task = None
+            self._dispatch_locked()
+
+    def _dispatch_locked(self):
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch):
+        # The worker is synchronous, so each item runs on the default
+        # threadpool; gather keeps the whole batch in flight concurrently.
+        outcomes = await asyncio.gather(
+            *[asyncio.to_thread(self._process_one, item) for item, _ in batch],
+            return_exceptions=True,
+        )
+        for (_, future), outcome in zip(batch, outcomes):
+            if future.cancelled():
+                continue
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    async def close(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
@@ -1,132 +1,202 @@
 # backend/utils.py
 
+import hashlib
 import os
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from azure.ai.formrecognizer import DocumentAnalysisClient
 from azure.core.credentials import AzureKeyCredential
 from dotenv import load_dotenv
 
-def get_result(file_content):
-    load_dotenv()
-    
-    endpoint = os.getenv("AZURE_DOCUMENT_ANALYSIS_ENDPOINT")
-    key = os.getenv("AZURE_DOCUMENT_ANALYSIS_KEY")
+load_dotenv()
 
-
-    azure_document_intelligence_client = DocumentAnalysisClient(
-        endpoint=endpoint, 
-        credential=AzureKeyCredential(key)
+# Read and validate credentials once at import: missing configuration should
+# surface at startup, not as a per-request surprise.
+_ENDPOINT = os.environ.get("AZURE_DOCUMENT_ANALYSIS_ENDPOINT")
+_KEY = os.environ.get("AZURE_DOCUMENT_ANALYSIS_KEY")
+if not _ENDPOINT or not _KEY:
+    raise RuntimeError(
+        "AZURE_DOCUMENT_ANALYSIS_ENDPOINT and AZURE_DOCUMENT_ANALYSIS_KEY "
+        "must be set (via the environment or a .env file)"
     )
-    poller = azure_document_intelligence_client.begin_analyze_document("prebuilt-read", file_content)
-    result = poller.result()
 
-    return "\n".join(get_paragraphs(result))
+# Single client shared across requests so the HTTP transport and TLS
+# connection pool are reused instead of re-established per upload.
+_CLIENT = DocumentAnalysisClient(
+    endpoint=_ENDPOINT,
+    credential=AzureKeyCredential(_KEY)
+)
 
 
-def get_paragraphs(result):
-    paragraphs = []
-    for paragaraph in result.paragraphs:
-        paragraphs.append(paragaraph.content)
-    return paragraphs
+_MODEL_ID = "prebuilt-read"
 
+# OCR results are cached on disk keyed by content hash: re-uploading the same
+# bytes costs a hash + file read instead of a multi-second, billed Azure call.
+# The model id is part of the file name so a model change invalidates entries.
+_CACHE_DIR = Path(
+    os.getenv("KNOWLEDGE_OCR_CACHE_DIR", str(Path.home() / ".cache" / "ai-knowledge" / "ocr"))
+)
 
-def _in_span(word, spans):
-    for span in spans:
-        if word.span.offset >= span.offset and (
-                word.span.offset + word.span.length) <= (span.offset +
-                                                         span.length):
-            return True
-    return False
+# Format templates for the per-line/per-word hot loop; %-formatting with a
+# prebuilt template is a single C call instead of per-iteration f-string
+# bytecode.
+_LINE_FMT = "...Line # %d has word count %d and text '%s' within bounding polygon '%s'"
+_WORD_FMT = "......Word '%s' has a confidence of %s"
 
 
-def get_words(page, line):
-    result = []
-    for word in page.words:
-        if _in_span(word, line.spans):
-            result.append(word)
-    return result
+def close_client():
+    """Release the shared client's transport; called on app shutdown."""
+    _CLIENT.close()
 
 
-def has_handwritten_content(result):
-    if result.styles and any([style.is_handwritten for style in result.styles]):
-        return True
-    else:
-        return False
+def get_result(file_content, verbose=False):
+    """
+    Extract a document's text with Azure Document Intelligence.
 
+    The service already returns the full concatenated text as
+    result.content, so by default no Python-side reassembly happens at all;
+    the per-line/per-word layout dump is only built when verbose is set.
+    """
+    # file_digest hashes the stream in chunks without a second full read
+    # into memory; rewind afterwards so Azure sees the whole file.
+    digest = hashlib.file_digest(file_content, "sha256").hexdigest()
+    file_content.seek(0)
 
-def analyze_page_layout(page):
-    layout_info = []
-    layout_info.append(f"*** Analyzing layout from page #{page.page_number} ***")
-    layout_info.append(f"Page has width: {page.width} and height: {page.height}, measured with unit: {page.unit}")
-    layout_info.append("")
-    return "\n".join(layout_info)
+    suffix = "-verbose" if verbose else ""
+    cache_path = _CACHE_DIR / f"{_MODEL_ID}-{digest}{suffix}.txt"
+    if cache_path.exists():
+        return cache_path.read_text(encoding="utf-8")
 
+    poller = _CLIENT.begin_analyze_document(_MODEL_ID, file_content)
+    result = poller.result()
 
-def analyze_lines(page):
-    lines_info = []
-    if page.lines:
-        for line_idx, line in enumerate(page.lines):
-            words = get_words(page, line)
-            lines_info.append(
-                f"\n- Line # {line_idx} has word count {len(words)} and text '{line.content}' "
-                f"within bounding polygon '{line.polygon}'"
-            )
-            for word in words:
-                lines_info.append(f"  - Word: {word.content}")
-    return "\n".join(lines_info)
+    text = get_full_analysis(result) if verbose else result.content
+    _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(text, encoding="utf-8")
+    return text
+
+
+def get_line_word_buckets(page):
+    """
+    Assign every word on the page to its owning line in one pass.
+
+    Words and line spans are both ordered by offset, so instead of scanning
+    every word for every line we sort the span boundaries once and
+    binary-search each word's offset into them: O((W + L) log L) instead of
+    the quadratic per-line scan.
+    """
+    buckets = [[] for _ in (page.lines or [])]
+    if not page.lines:
+        return buckets
+
+    line_bounds = sorted(
+        (span.offset, span.offset + span.length, line_idx)
+        for line_idx, line in enumerate(page.lines)
+        for span in line.spans
+    )
+    starts = [bound[0] for bound in line_bounds]
+
+    for word in page.words:
+        idx = bisect_right(starts, word.span.offset) - 1
+        if idx < 0:
+            continue
+        start, end, line_idx = line_bounds[idx]
+        if word.span.offset + word.span.length <= end:
+            buckets[line_idx].append(word)
+
+    return buckets
 
 
-def check_handwritten_content(result):
-    if result.styles and any([style.is_handwritten for style in result.styles]):
-        return "Document contains handwritten content"
+def has_handwritten_content(result):
+    # Generator expression so any() short-circuits on the first handwritten
+    # style instead of materializing the whole list first.
+    return bool(result.styles) and any(style.is_handwritten for style in result.styles)
+
+
+def check_handwritten_content(result, out):
+    if has_handwritten_content(result):
+        out.append("Document contains handwritten content")
     else:
-        return "Document does not contain handwritten content"
+        out.append("Document does not contain handwritten content")
 
 
-def analyze_page(page):
-    page_analysis = [
-        f"----Analyzing layout from page #{page.page_number}----",
-        f"Page has width: {page.width} and height: {page.height}, measured with unit: {page.unit}"
-    ]
+def analyze_page(page, out):
+    out.append(f"----Analyzing layout from page #{page.page_number}----")
+    out.append(f"Page has width: {page.width} and height: {page.height}, measured with unit: {page.unit}")
 
     if page.lines:
+        buckets = get_line_word_buckets(page)
+        append = out.append
+        extend = out.extend
         for line_idx, line in enumerate(page.lines):
-            words = get_words(page, line)
-            page_analysis.append(
-                f"...Line # {line_idx} has word count {len(words)} and text '{line.content}' "
-                f"within bounding polygon '{line.polygon}'"
-            )
-            for word in words:
-                page_analysis.append(
-                    f"......Word '{word.content}' has a confidence of {word.confidence}"
-                )
+            words = buckets[line_idx]
+            # Render the polygon (a list of Point objects) to a string once
+            # per line; %s on the raw object would walk and repr each point
+            # inside the format call.
+            line_poly = str(line.polygon)
+            append(_LINE_FMT % (line_idx, len(words), line.content, line_poly))
+            # Comprehension + one extend keeps the per-word work inside the
+            # interpreter's specialized comprehension loop instead of paying
+            # a method call per word.
+            extend([_WORD_FMT % (word.content, word.confidence) for word in words])
 
     if page.selection_marks:
         for selection_mark in page.selection_marks:
-            page_analysis.append(
+            out.append(
                 f"Selection mark is '{selection_mark.state}' within bounding polygon "
                 f"'{selection_mark.polygon}' and has a confidence of {selection_mark.confidence}"
             )
 
-    return "\n".join(page_analysis)
-
 
-def analyze_table(table_idx, table):
-    table_analysis = [
+def analyze_table(table_idx, table, out):
+    out.append(
         f"Table # {table_idx} has {table.row_count} rows and {table.column_count} columns"
-    ]
+    )
     if table.bounding_regions:
         for region in table.bounding_regions:
-            table_analysis.append(
-                f"Table # {table_idx} location on page: {region.page_number} is {region.polygon}"
+            region_poly = str(region.polygon)
+            out.append(
+                f"Table # {table_idx} location on page: {region.page_number} is {region_poly}"
             )
     for cell in table.cells:
-        table_analysis.append(
+        out.append(
             f"...Cell[{cell.row_index}][{cell.column_index}] has text '{cell.content}'"
         )
         if cell.bounding_regions:
             for region in cell.bounding_regions:
-                table_analysis.append(
-                    f"...content on page {region.page_number} is within bounding polygon '{region.polygon}'"
+                region_poly = str(region.polygon)
+                out.append(
+                    f"...content on page {region.page_number} is within bounding polygon '{region_poly}'"
                 )
 
-    return "\n.join(table_analysis)"
\ No newline at end of file
+
+def _page_fragments(page):
+    part = []
+    analyze_page(page, part)
+    return part
+
+
+def _table_fragments(indexed_table):
+    table_idx, table = indexed_table
+    part = []
+    analyze_table(table_idx, table, part)
+    return part
+
+
+def get_full_analysis(result):
+    """
+    Build the verbose layout dump for a whole analysis result.
+
+    Pages and tables are independent once the SDK result is materialized, so
+    they are analyzed concurrently on a thread pool; executor.map keeps the
+    output in document order and the fragments are joined exactly once.
+    """
+    out = []
+    check_handwritten_content(result, out)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for part in executor.map(_page_fragments, result.pages):
+            out.extend(part)
+        for part in executor.map(_table_fragments, enumerate(result.tables)):
+            out.extend(part)
+    return "\n".join(out)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import re
+import textwrap
 import ollama
 
 from typing import List, Any, Tuple, Optional, Generator, Dict
@@ -6,12 +7,67 @@ from collections.abc import Iterator
 from ollama._types import ChatResponse
 
 
+# One client for every Ollama call: the module-level ollama.chat/list helpers
+# build a fresh Client (and HTTP connection) per call, while a shared client
+# keeps the connection alive across requests.
+_CLIENT = ollama.Client()
+
 EMBEDDING_MODEL = "nomic-embed-text:latest"
 EXCLUDED_MODELS = {EMBEDDING_MODEL} 
 # Text Processing
 SEPARATORS = ["\n\n", "\n", ".", "!", "?", ",", " ", ""]
 # Model Configuration
 TOKEN_THRESHOLD = 2500  # For deciding when to use map-reduce summarization
+KEEP_ALIVE = "30m"  # Keep generation models resident between calls
+
+# Kept byte-identical across turns: a stable leading system message lets the
+# server reuse its prompt-prefix KV cache instead of re-prefilling the
+# instructions on every question.
+ANSWER_SYSTEM_PROMPT = (
+    "Answer the user's question using ONLY the provided context. "
+    "If the answer cannot be fully determined from the context, acknowledge "
+    "this and explain what can be determined from the available information."
+)
+
+ANSWER_PROMPT = "Question: {question}\n\nRelevant context:\n{context}\n\nAnswer:"
+
+# Built (and dedented) once at import: rebuilding the string per call is
+# wasted work, and the source indentation would otherwise be sent to the
+# model as prefill tokens.
+QUESTIONS_PROMPT = textwrap.dedent("""\
+    Based on this document, create three specific and insightful questions
+    that can be answered.
+
+    ---
+
+    Summary: {summary}
+
+    Requirements:
+    - Generate exactly three questions
+    - Questions should require detailed answers from the full text provided
+    - Focus on the most important aspects of the document
+    - Make questions specific rather than general
+    - The questions are supposed to be different from each other
+
+    Questions:""")
+
+# One compiled pass over the response: a non-blank line ending in '?' with
+# surrounding whitespace trimmed, same as the old splitlines/strip filter.
+_QUESTION_RE = re.compile(r"^[ \t]*((?:\S.*)?\?)[ \t\r]*$", re.MULTILINE)
+
+
+def prewarm_model(model_name: str) -> None:
+    """
+    Load a model into server memory ahead of the first real request.
+
+    An empty generate call makes Ollama page the weights in, and the
+    keep_alive window keeps them resident, so the first summary or answer
+    does not pay the cold-load latency.
+    """
+    try:
+        _CLIENT.generate(model=model_name, prompt="", keep_alive=KEEP_ALIVE)
+    except Exception as e:
+        print(f"Error prewarming model {model_name}: {e}")
 
 
 def get_nb_tokens(text: str) -> int:
@@ -40,7 +96,7 @@ def get_available_models() -> List[str]:
     (filtering during extraction) with maintainability (centralized configuration).
     """
     try:
-        items: List[Tuple[str, Any]] = ollama.list()
+        items: List[Tuple[str, Any]] = _CLIENT.list()
 
         # Extract and filter models in a single pass, using our configuration
         generation_models = [
@@ -97,32 +153,16 @@ def generate_questions(model_name: str, summary: str) -> List[str]:
     Returns exactly three questions that can be answered using the full document.
     """
     try:
-        prompt = f"""Based on this document, create three specific and insightful questions
-        that can be answered.
-
-        ---
-
-        Summary: {summary}
+        prompt = QUESTIONS_PROMPT.format(summary=summary)
 
-        Requirements:
-        - Generate exactly three questions
-        - Questions should require detailed answers from the full text provided
-        - Focus on the most important aspects of the document
-        - Make questions specific rather than general
-        - The questions are supposed to be different from each other
-
-        Questions:"""
-
-        response = ollama.chat(
+        response = _CLIENT.chat(
             model=model_name,
-            messages=[{'role': 'user', 'content': prompt}]
+            messages=[{'role': 'user', 'content': prompt}],
+            keep_alive=KEEP_ALIVE
         )
 
         # Extract questions from response
-        questions = [
-            line.strip() for line in response['message']['content'].splitlines()
-            if line.strip() and line.strip().endswith('?')
-        ]
+        questions = _QUESTION_RE.findall(response['message']['content'])
 
         # Ensure exactly three questions
         return (questions + [''] * 3)[:3]
@@ -143,20 +183,14 @@ def generate_answer(
         context_parts.append(f"[Context {i}]: {chunk}")
     context = "\n\n".join(context_parts)
 
-    messages = [{
-        'role': 'user',
-        'content': f"""Answer the following question using ONLY the provided context.
-        If the answer cannot be fully determined from the context, acknowledge this
-        and explain what can be determined from the available information.
-
-        Question: {question}
-
-        Relevant context:
-        {context}
-
-        Answer:"""
-    }]
+    messages = [
+        {'role': 'system', 'content': ANSWER_SYSTEM_PROMPT},
+        {
+            'role': 'user',
+            'content': ANSWER_PROMPT.format(question=question, context=context)
+        },
+    ]
 
-    response = ollama.chat(model=model_name, messages=messages, stream=True)
+    response = _CLIENT.chat(model=model_name, messages=messages, stream=True, keep_alive=KEEP_ALIVE)
 
     return response
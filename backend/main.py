@@ -2,16 +2,38 @@
 
 import os
 import asyncio
-from fastapi import FastAPI, UploadFile, File
-from fastapi.responses import StreamingResponse
+import tempfile
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, UploadFile, File, Body
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from pydantic import BaseModel
-from .helpers.doc_helper import get_result
+from .helpers.batch_helper import DynBatcher
+from .helpers.doc_helper import get_result, close_client
 from .helpers.language_helper import get_extractive_summary
-from .helpers.ollama_helper import get_nb_tokens, get_available_models 
-from .helpers.ollama_helper import generate_questions, generate_answer
+from .helpers.ollama_helper import get_nb_tokens, get_available_models
+from .helpers.ollama_helper import generate_questions, generate_answer, prewarm_model
 
 
-app = FastAPI()  
+def _analyze_upload(job):
+    spool, verbose = job
+    return get_result(spool, verbose=verbose)
+
+
+# Coalesces uploads arriving within a small window into one concurrent
+# fan-out on the shared Azure client, amortizing per-request overhead.
+analyze_batcher = DynBatcher(_analyze_upload, max_batch_size=8, max_delay=0.05)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await analyze_batcher.close()
+    close_client()
+
+
+# orjson serializes the multi-megabyte /analyze text payload several times
+# faster than the default pure-Python json path.
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 
 class TextContent(BaseModel):
@@ -29,14 +51,23 @@ class QuestionContent(BaseModel):
     model_name: str
 
 
-@app.post("/analyze/")  
-async def analyze_document_content(file: UploadFile = File(...)):  
-    content = await file.read()
-    try:
-        text = get_result(content)
-    except UnicodeDecodeError:
-        text = "Error reading file contents. Please upload a valid file."
-    return {"text": text}  
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Read uploads in 1 MiB chunks
+UPLOAD_SPOOL_SIZE = 8 * 1024 * 1024  # Spill to disk beyond 8 MiB
+
+
+@app.post("/analyze/")
+async def analyze_document_content(file: UploadFile = File(...), verbose: bool = False):
+    # Stream the upload into a spooled temp file instead of materializing the
+    # whole payload as one bytes object; Azure accepts a readable stream.
+    with tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE) as spool:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            spool.write(chunk)
+        spool.seek(0)
+        # No decode happens on our side (the stream goes straight to the SDK
+        # and the text comes back as str), so there is no UnicodeDecodeError
+        # to catch here; SDK errors propagate as usual.
+        text = await analyze_batcher.process_batched((spool, verbose))
+    return {"text": text}
 
 
 @app.post("/summarize/")
@@ -46,11 +77,19 @@ async def chat(text_content: TextContent):
 
 
 @app.post("/estimate_tokens/")
-async def estimate_tokens(text_content: TextContent):
-    nb_tokens = get_nb_tokens(text_content.content)
+async def estimate_tokens(content: str = Body(..., embed=True)):
+    # Body(..., embed=True) keeps the {"content": ...} wire shape but skips
+    # BaseModel construction, which dominates this near-no-op endpoint.
+    nb_tokens = get_nb_tokens(content)
     return {"nb_tokens": nb_tokens}
 
 
+@app.post("/prewarm/")
+async def prewarm(model_name: str = Body(..., embed=True)):
+    await asyncio.to_thread(prewarm_model, model_name)
+    return {"status": "ok"}
+
+
 @app.get("/get_models/")
 async def get_models():
     return {"available_models": get_available_models()}
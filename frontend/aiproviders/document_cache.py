@@ -0,0 +1,61 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+# Derived artifacts (summary, suggested questions) persisted per upload
+# digest, so re-opening a known document - even after an app restart - skips
+# the LLM calls entirely.
+CACHE_DIR = Path.home() / ".cache" / "ai-knowledge" / "derived"
+
+
+def _entry_path(digest: str, name: str) -> Path:
+    return CACHE_DIR / digest / name
+
+
+@lru_cache(maxsize=32)
+def _read_entry(digest: str, name: str) -> Optional[str]:
+    # Streamlit reruns the script on every interaction; memoizing on the
+    # short digest key turns repeat loads into dictionary lookups instead of
+    # file reads. Writers below clear the cache so stale entries never
+    # survive a save or removal.
+    path = _entry_path(digest, name)
+    if path.exists():
+        return path.read_text(encoding="utf-8")
+    return None
+
+
+def load_text(digest: Optional[str], name: str) -> Optional[str]:
+    if not digest:
+        return None
+    return _read_entry(digest, name)
+
+
+def save_text(digest: Optional[str], name: str, text: str) -> None:
+    if not digest:
+        return
+    path = _entry_path(digest, name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    _read_entry.cache_clear()
+
+
+def remove(digest: Optional[str], name: str) -> None:
+    if not digest:
+        return
+    _entry_path(digest, name).unlink(missing_ok=True)
+    _read_entry.cache_clear()
+
+
+def load_json(digest: Optional[str], name: str) -> Optional[Any]:
+    raw = load_text(digest, name)
+    if raw is None:
+        return None
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+
+
+def save_json(digest: Optional[str], name: str, value: Any) -> None:
+    save_text(digest, name, json.dumps(value))
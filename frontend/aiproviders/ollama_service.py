@@ -1,6 +1,7 @@
+import orjson
 import requests
 
-from typing import List, Optional, Generator
+from typing import Dict, List, Optional, Generator, Tuple
 from dataclasses import dataclass, field
 
 from .config import TOKEN_THRESHOLD
@@ -21,11 +22,19 @@ class StreamResponse:
 class OllamaService:
     def __init__(self):
         self._available_models: Optional[List[str]] = None
+        self._token_estimates: Dict[Tuple[int, int], int] = {}
         self.TOKEN_THRESHOLD = TOKEN_THRESHOLD
 
     def _estimate_tokens(self, text: str) -> int:
-        response = requests.post("http://localhost:8000/estimate_tokens/", json={"content": text})
-        nb_tokens = int(response.json()["nb_tokens"])
+        # Memoized on a cheap proxy key (length + hash of the head) so repeat
+        # estimates for the same document are an O(1) lookup instead of a
+        # round-trip to the backend.
+        key = (len(text), hash(text[:4096]))
+        nb_tokens = self._token_estimates.get(key)
+        if nb_tokens is None:
+            response = requests.post("http://localhost:8000/estimate_tokens/", json={"content": text})
+            nb_tokens = int(orjson.loads(response.content)["nb_tokens"])
+            self._token_estimates[key] = nb_tokens
         return nb_tokens
 
     @property
@@ -35,16 +44,24 @@ class OllamaService:
         return self._available_models
 
     def _get_available_models(self) -> List[str]:
-        generation_models = requests.get("http://localhost:8000/get_models/").json()["available_models"]
+        response = requests.get("http://localhost:8000/get_models/")
+        generation_models = orjson.loads(response.content)["available_models"]
         return generation_models
 
 
+    def prewarm(self, model_name: str) -> None:
+        """Ask the backend to load the model ahead of the first generation."""
+        try:
+            requests.post("http://localhost:8000/prewarm/", json={"model_name": model_name})
+        except requests.RequestException as e:
+            print(f"Error prewarming model {model_name}: {e}")
+
     def generate_questions(self, model_name: str, summary: str) -> List[str]:
         response = requests.post(
             "http://localhost:8000/generate_questions/", json={"model_name": model_name, "content": summary}
         )
 
-        questions = response.json()["questions"]
+        questions = orjson.loads(response.content)["questions"]
 
         return questions
 
@@ -54,10 +71,13 @@ class OllamaService:
         relevant_chunks: List[str],
         model_name: str
     ) -> Generator[StreamResponse, None, None]:
-        stream = requests.post(
-            "http://localhost:8000/generate_answer", 
+        # orjson parses the chunk list noticeably faster than stdlib json on
+        # long answers, where this payload is the largest we decode.
+        response = requests.post(
+            "http://localhost:8000/generate_answer",
             json={"question": question, "relevant_chunks": relevant_chunks, "model_name": model_name}
-        ).json()["answer"]
+        )
+        stream = orjson.loads(response.content)["answer"]
         
         first_chunk = True
         for chunk in stream:
@@ -12,6 +12,10 @@ from .config import (
     SEPARATORS
 )
 
+# Shared client so every embedding call reuses one keep-alive connection
+# instead of the per-call connection made by the module-level ollama helpers.
+_CLIENT = ollama.Client()
+
 class VectorStoreError(Exception):
     """Base exception class for vector store operations"""
     pass
@@ -76,7 +80,7 @@ class VectorStore:
             embeddings = []
             for chunk in chunks:
                 try:
-                    response = ollama.embeddings(
+                    response = _CLIENT.embeddings(
                         model=EMBEDDING_MODEL,
                         prompt=chunk
                     )
@@ -121,7 +125,7 @@ class VectorStore:
         """
         try:
             # Generate embedding for the query
-            query_embedding = ollama.embeddings(
+            query_embedding = _CLIENT.embeddings(
                 model=EMBEDDING_MODEL,
                 prompt=query
             )["embedding"]
@@ -176,7 +180,7 @@ class VectorStore:
             self.collection.count()
             
             # Check if embedding model is available
-            ollama.embeddings(
+            _CLIENT.embeddings(
                 model=EMBEDDING_MODEL,
                 prompt="test"
             )
@@ -50,6 +50,7 @@ class KnowlEdgeApp:
                 available_models,
                 key="model_selector"
             )
+            self.state_manager.prewarm_model(st.session_state.selected_model)
         else:
             st.warning("No Ollama models found. Please ensure Ollama is running and models are installed.")
             return
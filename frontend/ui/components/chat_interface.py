@@ -1,7 +1,26 @@
+import time
+
 import streamlit as st
 from datetime import datetime
 from aiproviders import Message, OllamaService
 
+# Number of recent messages rendered inline on every rerun; older turns are
+# collapsed so long conversations stop paying O(history) render cost.
+HISTORY_WINDOW = 20
+
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=256)
+def _cached_relevant_chunks(doc_hash: str, question: str, k: int) -> list:
+    """
+    Retrieve relevant chunks, cached per (document, question, k).
+
+    Repeat questions (e.g. clicking the same suggested question twice) skip
+    the embedding call and vector search entirely; doc_hash keys the cache so
+    a new upload never serves stale chunks.
+    """
+    return st.session_state.processor.get_relevant_chunks(question, k=k)
+
+
 class ChatInterface:
     def __init__(self, ollama_service: OllamaService):
         self.ollama_service = ollama_service
@@ -33,20 +52,43 @@ class ChatInterface:
 
         relevant_chunks_for_display = []
         with assistant_placeholder.chat_message("assistant"):
+            committed_container = st.container()
             placeholder = st.empty()
             full_response = ""
+            committed_len = 0
+
+            def flush():
+                # Completed lines are written once into the committed
+                # container; only the unfinished tail line is re-parsed and
+                # re-rendered per flush, so markdown work stays O(n) in
+                # answer length instead of O(n^2). Constructs spanning
+                # multiple lines (fenced code, lists) may render per-segment
+                # while streaming; the final history render shows them whole.
+                nonlocal committed_len
+                boundary = full_response.rfind("\n") + 1
+                if boundary > committed_len:
+                    with committed_container:
+                        st.markdown(full_response[committed_len:boundary])
+                    committed_len = boundary
+                placeholder.markdown(full_response[committed_len:])
 
             with st.spinner("Generating answer..."):
                 try:
                     # Retrieve relevant chunks only if they haven't been loaded yet
                     if not st.session_state.chat_history_with_context[-1]["context_loaded"]:
-                        relevant_chunks = st.session_state.processor.get_relevant_chunks(question, k=3)
+                        relevant_chunks = _cached_relevant_chunks(
+                            st.session_state.processor.document_hash, question, 3
+                        )
                         relevant_chunks_for_display = list(relevant_chunks)
 
                         # Update the assistant entry with context and set the flag to True
                         st.session_state.chat_history_with_context[-1]["context"] = relevant_chunks_for_display
                         st.session_state.chat_history_with_context[-1]["context_loaded"] = True
 
+                    # Coalesce streamed chunks and repaint at most every
+                    # 50ms; re-rendering the markdown per token is what
+                    # dominates client-side cost on long answers.
+                    last_flush = time.monotonic()
                     for response in self.ollama_service.generate_answer(
                         question,
                         relevant_chunks_for_display,
@@ -56,11 +98,14 @@ class ChatInterface:
                             st.error(response.error_message)
                             break
                         full_response += response.content
-                        placeholder.markdown(full_response)
+                        if time.monotonic() - last_flush > 0.05:
+                            flush()
+                            last_flush = time.monotonic()
 
                         # Update the assistant entry's content as we stream
                         st.session_state.chat_history_with_context[-1]["content"] = full_response
 
+                    flush()
                     st.session_state.processor.messages.append(
                         Message("assistant", full_response, datetime.now())
                     )
@@ -78,28 +123,42 @@ class ChatInterface:
                     # Set context_displayed to True after rendering the expander
                     st.session_state.chat_history_with_context[-1]["context_displayed"] = True
 
+    def _render_history_item(self, item):
+        """Render one stored chat turn, including its source context."""
+        if item["role"] == "user":
+            with st.chat_message("user"):
+                st.markdown(item["content"])
+        elif item["role"] == "assistant":
+            with st.chat_message("assistant"):
+                st.markdown(item["content"])
+                if item.get("context") and item.get("context_displayed"):
+                    with st.expander("View source context", expanded=False):
+                        for i, chunk in enumerate(item["context"], 1):
+                            st.markdown(f"**Context {i}:**")
+                            st.markdown(chunk)
+                            st.markdown("---")
+
+    @st.fragment
     def handle_chat_interaction(self):
         """
         Process chat interactions including suggested questions and direct input.
         Manages the chat interface, message history, and question handling.
+
+        Runs as a fragment: sending or streaming a message reruns only this
+        subtree, not the uploader and summary panes above it.
         """
         # Create a container for the chat history
         chat_history_container = st.container()
 
         with chat_history_container:
-            for item in st.session_state.chat_history_with_context:
-                if item["role"] == "user":
-                    with st.chat_message("user"):
-                        st.markdown(item["content"])
-                elif item["role"] == "assistant":
-                    with st.chat_message("assistant"):
-                        st.markdown(item["content"])
-                        if item.get("context") and item.get("context_displayed"):
-                            with st.expander("View source context", expanded=False):
-                                for i, chunk in enumerate(item["context"], 1):
-                                    st.markdown(f"**Context {i}:**")
-                                    st.markdown(chunk)
-                                    st.markdown("---")
+            history = st.session_state.chat_history_with_context
+            older, recent = history[:-HISTORY_WINDOW], history[-HISTORY_WINDOW:]
+            if older:
+                with st.expander(f"Show {len(older)} older messages", expanded=False):
+                    for item in older:
+                        self._render_history_item(item)
+            for item in recent:
+                self._render_history_item(item)
 
         # Handle new question or input
         if st.session_state.needs_answer and st.session_state.current_question:
@@ -1,12 +1,54 @@
 import time
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
-from aiproviders import OllamaService
+from aiproviders import OllamaService, document_cache
 import requests
 
+# Blocking backend calls run here so the Streamlit script thread stays free
+# and the rest of the page remains interactive while a summary is pending.
+EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
 class DocumentViewer:
     def __init__(self, ollama_service: OllamaService):
         self.ollama_service = ollama_service
 
+    def _generate_questions_in_background(self, summary: str):
+        """
+        Start suggested-question generation while the summary is still being
+        replayed to the user. The questions prompt needs the summary text, so
+        the two model calls cannot be issued together; overlapping generation
+        with the replay hides most of its latency instead. This is the only
+        path that generates questions - the suggestions section polls the
+        future stashed here rather than issuing its own call.
+        """
+        model_name = st.session_state.selected_model
+        service = self.ollama_service
+        file_digest = st.session_state.processor.file_digest
+
+        def generate():
+            questions = document_cache.load_json(file_digest, "questions.json")
+            if questions is None:
+                questions = service.generate_questions(model_name, summary=summary)
+                document_cache.save_json(file_digest, "questions.json", questions)
+            return questions
+
+        st.session_state.questions_future = EXECUTOR.submit(generate)
+
+    @st.fragment(run_every=0.3)
+    def _poll_summary_future(self):
+        """
+        Pending indicator for the summarize future. Reruns only this
+        fragment until the future resolves, then escalates to a full-app
+        rerun so the replay (and the sections gated on the summary) can
+        render.
+        """
+        future = st.session_state.summary_future
+        if future is not None and not future.done():
+            st.info("Azure Text Analytics Summary is running...")
+        else:
+            st.rerun(scope="app")
+
     def display_text_and_summary(self, col1, col2):
         """
         Display the document text and generate/display its summary.
@@ -14,12 +56,8 @@ class DocumentViewer:
         handling token estimation and summary generation.
         """
         with col1:
-            if st.session_state.processor.token_count is None and st.session_state.processor.document_text:
-                estimated_tokens = self.ollama_service._estimate_tokens(
-                    st.session_state.processor.document_text
-                )
-                st.session_state.processor.token_count = estimated_tokens
-
+            # token_count is filled in by a background thread started on
+            # upload; until it lands the expander title simply omits it.
             with st.expander("Extracted Text" + (
                 f" (Estimated tokens: {st.session_state.processor.token_count:,})"
                 if st.session_state.processor.token_count is not None else ""
@@ -37,30 +75,51 @@ class DocumentViewer:
         with col2:
             with st.expander("Summary", expanded=True):
                 if not st.session_state.processor.summary and not st.session_state.summary_in_progress:
-                    text_area_placeholder = st.empty()
-                    with st.spinner("Azure Text Analytics Summary is running..."):
-                        st.session_state.summary_in_progress = True
-                        full_response = ""
-
-                        try:
+                    file_digest = st.session_state.processor.file_digest
+                    response = document_cache.load_text(file_digest, "summary.txt")
+                    if response is None:
+                        # Run the blocking summarize call on the executor and
+                        # poll its future from a fragment, so the suggestions
+                        # and chat sections below still render and stay
+                        # interactive in the meantime.
+                        future = st.session_state.summary_future
+                        if future is None:
                             text_content = st.session_state.processor.document_text
-                            text_summary = requests.post("http://localhost:8000/summarize/", json={"content": text_content})
-                            response = str(text_summary.json()["summary"])
+                            future = EXECUTOR.submit(
+                                requests.post,
+                                "http://localhost:8000/summarize/",
+                                json={"content": text_content},
+                            )
+                            st.session_state.summary_future = future
+                        if not future.done():
+                            self._poll_summary_future()
+                            return
+                        st.session_state.summary_future = None
+                        response = str(future.result().json()["summary"])
+                        document_cache.save_text(file_digest, "summary.txt", response)
+
+                    text_area_placeholder = st.empty()
+                    st.session_state.summary_in_progress = True
+                    full_response = ""
+                    try:
+                        self._generate_questions_in_background(response)
 
-                            for response in response.split():
-                                full_response += response + " "
-                                text_area_placeholder.text_area(
-                                    "",
-                                    value=full_response,
-                                    height=300,
-                                    key=f"summary_stream_{st.session_state.update_counter}"
-                                )
-                                st.session_state.update_counter += 1
-                                time.sleep(0.05)
+                        # Update a single placeholder element, flushing at
+                        # most every 50ms: one in-place DOM update per
+                        # flush instead of a brand-new keyed widget per
+                        # word.
+                        last_flush = time.monotonic()
+                        for word in response.split():
+                            full_response += word + " "
+                            if time.monotonic() - last_flush > 0.05:
+                                text_area_placeholder.text(full_response)
+                                last_flush = time.monotonic()
+                            time.sleep(0.01)
+                        text_area_placeholder.text(full_response)
 
-                            st.session_state.processor.summary = full_response
-                        finally:
-                            st.session_state.summary_in_progress = False
+                        st.session_state.processor.summary = full_response
+                    finally:
+                        st.session_state.summary_in_progress = False
                 else:
                     st.text_area(
                         "",
@@ -71,6 +130,11 @@ class DocumentViewer:
 
                 if st.session_state.processor.summary:
                     if st.button("Regenerate Summary"):
+                        # Drop the cached copy too, or the regeneration would
+                        # just replay it.
+                        document_cache.remove(
+                            st.session_state.processor.file_digest, "summary.txt"
+                        )
                         st.session_state.processor.summary = None
                         st.session_state.summary_in_progress = False
                         st.rerun()
@@ -7,33 +7,56 @@ class QuestionSuggestions:
 
     def display_suggested_questions(self):
         """
-        Generate and display suggested questions about the document.
+        Display suggested questions about the document.
+
+        Generation itself happens in the background, started alongside the
+        summary replay; this section only polls the resulting future and
+        renders the buttons once it resolves.
+        """
+        future = st.session_state.questions_future
+        if future is not None:
+            if not future.done():
+                self._poll_questions_future()
+                return
+            st.session_state.questions_future = None
+            st.session_state.questions_generated = True
+            try:
+                st.session_state.processor.suggested_questions = future.result()
+            except Exception as e:
+                st.error(f"Error generating questions: {e}")
+                return
+
+        self._render_questions()
+
+    @st.fragment(run_every=0.3)
+    def _poll_questions_future(self):
+        """
+        Pending indicator for the questions future. Reruns only this
+        fragment until the future resolves, then escalates to a full-app
+        rerun so the buttons (and anything gated on them) can render.
         """
-        if not st.session_state.questions_generated:
-            if not st.session_state.processor.suggested_questions and not st.session_state.summary_in_progress:
-                with st.spinner("Generating suggested questions..."):
-                    try:
-                        questions = self.ollama_service.generate_questions(
-                            st.session_state.selected_model,
-                            summary=st.session_state.processor.summary
-                        )
-                        st.session_state.processor.suggested_questions = questions
-                        st.session_state.questions_generated = True
-                    except Exception as e:
-                        st.error(f"Error generating questions: {e}")
-                        return
+        future = st.session_state.questions_future
+        if future is not None and not future.done():
+            st.info("Generating suggested questions...")
+        else:
+            st.rerun(scope="app")
+
+    @st.fragment
+    def _render_questions(self):
+        """
+        Render the suggested-question buttons.
 
-        # Display logic
-        if st.session_state.questions_generated and st.session_state.processor.suggested_questions:
+        Runs as a fragment so button rendering does not force the summary
+        pane and uploader to rerun.
+        """
+        if st.session_state.processor.suggested_questions:
             for i, question in enumerate(st.session_state.processor.suggested_questions):
                 if question and st.button(f"📝 {question}", key=f"question_button_{i}"):
                     st.session_state.current_question = question
                     st.session_state.needs_answer = True
                     st.session_state.display_chunks = True
-                    st.rerun()
-        elif st.session_state.questions_generated and not st.session_state.processor.suggested_questions:
+                    # The chat fragment has to pick up needs_answer, so this
+                    # click escalates to a full-app rerun.
+                    st.rerun(scope="app")
+        elif st.session_state.questions_generated:
             st.info("No suggested questions were generated.")
-        elif not st.session_state.questions_generated and not st.session_state.summary_in_progress:
-            st.info("Generating suggested questions...")
-        elif st.session_state.summary_in_progress:
-            st.info("Please wait for the summary to be generated before generating questions.")
\ No newline at end of file
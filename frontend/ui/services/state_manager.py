@@ -1,3 +1,5 @@
+import threading
+
 import streamlit as st
 from aiproviders import DocumentProcessor, OllamaService
 
@@ -17,22 +19,40 @@ class StateManager:
             'needs_answer': False,
             'current_question': None,
             'uploaded_file_name': None,
+            'uploaded_file_id': None,
+            'uploaded_file_digest': None,
             'summary_in_progress': False,
+            'summary_future': None,
             'questions_generated': False,
-            'update_counter': 0,
+            'questions_future': None,
             'display_chunks': False,
             'chat_history_with_context': [],
-            'extracting_text': False
+            'extracting_text': False,
+            'prewarmed_model': None
         }
 
         for key, initial_value in initial_states.items():
             if key not in st.session_state:
                 st.session_state[key] = initial_value
 
+    def prewarm_model(self, model_name: str):
+        """
+        Fire-and-forget prewarm of the selected model so the first summary
+        or answer doesn't pay the cold-load latency. Guarded per model so a
+        rerun doesn't re-issue the request.
+        """
+        if st.session_state.prewarmed_model == model_name:
+            return
+        st.session_state.prewarmed_model = model_name
+        threading.Thread(
+            target=self.ollama_service.prewarm, args=(model_name,), daemon=True
+        ).start()
+
     def reset_document_states(self):
         """Reset states for new document processing"""
-        st.session_state.update_counter = 0
         st.session_state.summary_in_progress = False
+        st.session_state.summary_future = None
         st.session_state.questions_generated = False
+        st.session_state.questions_future = None
         st.session_state.processor.suggested_questions = None
         st.session_state.chat_history_with_context = []
\ No newline at end of file
@@ -1,10 +1,13 @@
+import hashlib
+import threading
+
 import streamlit as st
 
 class UICoordinator:
     def __init__(self, state_manager):
         self.state_manager = state_manager
 
-    def process_new_document(self, file_name: str, file_type: str, file_bytes: bytes):
+    def process_new_document(self, file_name: str, file_type: str, file_bytes: bytes, file_digest: str):
         """
         Process a new document and reset relevant application state.
         Handles document processing and initializes RAG components.
@@ -12,10 +15,14 @@ class UICoordinator:
         st.session_state.extracting_text = True
         try:
             with st.spinner("Azure Document Intelligence is extracting content..."):
-                st.session_state.processor.process_new_document(file_name, file_type, file_bytes)
+                st.session_state.processor.process_new_document(file_name, file_type, file_bytes, file_digest)
                 st.session_state.uploaded_file_name = file_name
                 st.success("New file uploaded and processed!")
 
+            # Estimate tokens once per document in the background instead of
+            # on the first render, which froze the UI on long documents.
+            self._estimate_tokens_in_background(st.session_state.processor)
+
             # Reset states for new document
             self.state_manager.reset_document_states()
 
@@ -24,11 +31,38 @@ class UICoordinator:
         finally:
             st.session_state.extracting_text = False
 
+    def _estimate_tokens_in_background(self, processor):
+        """Fill in processor.token_count without blocking the script thread."""
+        if not processor.document_text:
+            return
+
+        def estimate(text=processor.document_text):
+            try:
+                processor.token_count = self.state_manager.ollama_service._estimate_tokens(text)
+            except Exception as e:
+                print(f"Error estimating tokens: {e}")
+
+        threading.Thread(target=estimate, daemon=True).start()
+
     def handle_file_upload(self, uploaded_file):
         """Handle file upload and document processing."""
-        if uploaded_file.name != st.session_state.uploaded_file_name:
+        # file_id only changes when the user submits a new upload, so this
+        # O(1) gate keeps ordinary reruns from copying and hashing the whole
+        # payload.
+        if uploaded_file.file_id == st.session_state.uploaded_file_id:
+            return
+        st.session_state.uploaded_file_id = uploaded_file.file_id
+
+        # Compare content digests rather than filenames: a renamed copy of
+        # the same file is not a new document, and a different file under
+        # the same name is.
+        data = uploaded_file.getvalue()
+        digest = hashlib.sha256(data).hexdigest()
+        if digest != st.session_state.uploaded_file_digest:
+            st.session_state.uploaded_file_digest = digest
             self.process_new_document(
                 uploaded_file.name,
                 uploaded_file.type,
-                uploaded_file.getvalue()
+                data,
+                digest
             )
\ No newline at end of file